@@ -0,0 +1,45 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional compiled fast path for job-ID extraction.
+
+Scans a bytes buffer for job-search/XXXXXXXX links in a single tight C
+loop - useful when batch-processing hundreds of archived HTML dumps.
+
+Build it with:
+    pip3 install cython
+    cythonize -i _extract_fast.pyx
+
+extract_jobs_from_html.py falls back to the pure-Python regex scanner
+when this extension is not built, so building it is entirely optional.
+"""
+
+
+def extract_ids(bytes data):
+    """Return the sorted unique 8-digit job IDs found in ``data``."""
+    cdef const unsigned char* buf = data
+    cdef Py_ssize_t n = len(data)
+    cdef Py_ssize_t pos = 0, j, d
+    cdef long value
+    cdef unsigned char c
+    cdef bint ok
+    cdef set ids = set()
+
+    while True:
+        pos = data.find(b"job-search/", pos)
+        if pos == -1:
+            break
+        j = pos + 11  # len(b"job-search/")
+        pos = j
+        if j + 8 <= n:
+            value = 0
+            ok = True
+            for d in range(8):
+                c = buf[j + d]
+                if c < 0x30 or c > 0x39:  # not an ASCII digit
+                    ok = False
+                    break
+                value = value * 10 + (c - 0x30)
+            if ok:
+                ids.add(value)
+
+    return sorted(ids)
@@ -21,7 +21,8 @@ OTHER = None             # Optional other document ID
 # Leave as "0" for first run
 DATE = "0"
 
-# Job keywords to look for (currently not used in code but reserved for future features)
+# Job keywords to look for in bulk mode - job titles must match one of these
+# (leave empty to apply to everything)
 JOB_KEYWORDS = [
     "data analyst",
     "data engineer",
@@ -30,7 +31,7 @@ JOB_KEYWORDS = [
     "data science"
 ]
 
-# Keywords to skip jobs with (currently not used in code but reserved for future features)
+# Keywords that make bulk mode skip a job
 SKIP_KEYWORDS = [
     "physical therapist",
     "medical",
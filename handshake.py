@@ -1,20 +1,48 @@
 import requests
 import json
+import re
 import datetime
 import csv
 import os
-import subprocess
 import atexit
 import shutil
+import concurrent.futures
+import threading
+import queue
 from pathlib import Path
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # Rust/SIMD JSON - 2-5x faster on the GraphQL payloads
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick  # optional: single-pass matching for big keyword lists
+except ImportError:
+    ahocorasick = None
+
+
+def _json_loads(data):
+    """Parse JSON bytes/str, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj):
+    """Serialize to JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
 
 CONF_FILE = "conf.py"
 JOBS_FILE = "jobs.csv"
 WAIT_FILE = "wait.json"
 NEW_JOBS_FILE = "new_jobs.csv"
 HTML_FOLDER = "html"
-EXTRACTOR_SCRIPT = "extract_jobs_from_html.py"
-LEN_CSRF = 88
 HOST = "app.joinhandshake.com"  # Changed from binghamton.joinhandshake.com
 ACCEPT_GET = "application/json"
 ACCEPT_POST = "application/json, text/javascript, */*; q=0.01"
@@ -23,6 +51,14 @@ RESUME_TYPE_ID = 1
 COVER_TYPE_ID = 2
 TRANSCRIPT_TYPE_ID = 3
 OTHER_DOCUMENT_TYPE_ID = 5
+# frozenset: O(1) membership and no per-call tuple construction in apply()
+_SUPPORTED_DOC_TYPES = frozenset({RESUME_TYPE_ID, COVER_TYPE_ID,
+                                  TRANSCRIPT_TYPE_ID, OTHER_DOCUMENT_TYPE_ID})
+DETAIL_WORKERS = 16  # threads prefetching per-job details (network-bound)
+_EMPTY = {}  # shared read-only default so hot get() calls don't allocate
+GRAPHQL_PER_PAGE = 100  # jobs per GraphQL page - amortizes round-trip overhead
+GRAPHQL_BATCH_PAGES = 8  # aliased pages bundled into one batched POST
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
 
 
 def cleanup_on_exit():
@@ -70,43 +106,47 @@ def cleanup_on_exit():
 
 
 def sanitize_url(url):
-    left = url.find("page=")
-    if left != -1:
-        right = url.find('&', left)
-        if right != -1:
-            return url[:left] + url[right + 1:]
-        return url[:left]
-    return url
+    """Rebuild ``url`` without its page parameter. urllib's parsers handle
+    the edge cases the old find/slice arithmetic got wrong (a 'page' substring
+    inside another key, trailing '&', encoded characters)."""
+    parsed = urlparse(url)
+    query = [(key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+             if key != 'page']
+    return urlunparse(parsed._replace(query=urlencode(query)))
 
 
 def check_and_extract_html():
-    """Check for HTML files and auto-extract job IDs if found."""
+    """Check for HTML files and auto-extract job IDs if found.
+    Returns the list of extracted job IDs, or None when there is nothing
+    to extract."""
     html_path = Path(HTML_FOLDER)
     
     # Check if html folder exists and has HTML files
     if not html_path.exists():
-        return False
-    
-    html_files = list(html_path.glob('*.html')) + list(html_path.glob('*.htm'))
+        return None
+
+    # Single scandir pass instead of two globs (one directory walk, and
+    # DirEntry carries cached stat info)
+    html_files = [Path(entry.path) for entry in os.scandir(html_path)
+                  if entry.is_file() and entry.name.endswith(('.html', '.htm'))]
     if not html_files:
-        return False
+        return None
     
     print("="*70)
     print(f"📂 Found {len(html_files)} HTML file(s) in '{HTML_FOLDER}/' folder")
     print("🔄 Auto-extracting job IDs...")
     print("="*70)
     print()
-    
-    # Run the extraction script
+
+    # Run the extractor in-process - no interpreter startup, and the IDs come
+    # back as a list instead of round-tripping through new_jobs.csv
     try:
-        result = subprocess.run(
-            ['python3', EXTRACTOR_SCRIPT],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print(result.stdout)
-        
+        import extract_jobs_from_html as extractor
+        job_ids = extractor.process_html_folder(HTML_FOLDER)
+        if job_ids:
+            # Keep new_jobs.csv as a backwards-compatible artifact
+            extractor.save_job_ids_to_csv(job_ids, NEW_JOBS_FILE)
+
         # Clean up HTML files after successful extraction
         print("🧹 Cleaning up HTML files...")
         for html_file in html_files:
@@ -115,15 +155,11 @@ def check_and_extract_html():
                 print(f"   ✅ Deleted: {html_file.name}")
             except Exception as e:
                 print(f"   ⚠️  Could not delete {html_file.name}: {e}")
-        
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"⚠️  Error running extraction: {e}")
-        print(e.stderr)
-        return False
+
+        return job_ids or None
     except Exception as e:
-        print(f"⚠️  Unexpected error: {e}")
-        return False
+        print(f"⚠️  Error running extraction: {e}")
+        return None
 
 
 def read_new_jobs():
@@ -133,14 +169,17 @@ def read_new_jobs():
         return None
     
     try:
-        job_ids = []
-        with open(NEW_JOBS_FILE, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                job_id = row.get('job_id', '').strip()
-                if job_id and job_id.isdigit():
-                    job_ids.append(int(job_id))
-        
+        with open(NEW_JOBS_FILE, 'r', newline='', encoding='utf-8') as csvfile:
+            # csv.reader + a column index instead of DictReader: only job_id
+            # is consumed, so per-row dict building was pure overhead
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if header is None or 'job_id' not in header:
+                return None
+            idx = header.index('job_id')
+            job_ids = [int(row[idx]) for row in reader
+                       if len(row) > idx and row[idx].strip().isdigit()]
+
         return job_ids if job_ids else None
     except Exception as e:
         print(f"⚠️  Error reading {NEW_JOBS_FILE}: {e}")
@@ -164,6 +203,43 @@ def cleanup_new_jobs_file():
     return True
 
 
+# Below this many keywords, an alternation regex wins; above it, the
+# Aho-Corasick automaton's single O(len(name)) walk pays off
+_AHOCORASICK_MIN_KEYWORDS = 20
+
+
+def _build_keyword_matcher(keywords):
+    """Build a predicate answering "does this job name contain a keyword?"
+    Returns None when the list is empty (meaning: no filtering)."""
+    if not keywords:
+        return None
+    keywords = [keyword.lower() for keyword in keywords]
+    if ahocorasick is not None and len(keywords) >= _AHOCORASICK_MIN_KEYWORDS:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda name: next(automaton.iter(name.lower()), None) is not None
+    pattern = re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+    return lambda name: pattern.search(name) is not None
+
+
+def _write_if_changed(path, new_bytes):
+    """Write ``new_bytes`` to ``path`` atomically (tmp file + rename), and
+    skip the write entirely when the content is unchanged - a crash can no
+    longer leave a truncated conf/wait file behind."""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == new_bytes:
+                return
+    except OSError:
+        pass
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(new_bytes)
+    os.replace(tmp_path, path)
+
+
 def write_conf(configs):
     """Write the configuration dictionary back to the Python config file."""
     import pprint
@@ -187,18 +263,17 @@ OTHER = {configs.get("other", None)!r}
 # Last run date (ISO format)
 DATE = {repr(configs["date"])}
 
-# Job keywords to look for (not currently used in code but from template)
+# Job keywords to look for in bulk mode (empty list = apply to everything)
 JOB_KEYWORDS = {configs.get("job_keywords", [])!r}
 
-# Keywords to skip jobs with (not currently used in code but from template)
+# Keywords that make bulk mode skip a job
 SKIP_KEYWORDS = {configs.get("skip_keywords", [])!r}
 
 # Session cookies - REQUIRED for authentication
 COOKIES = {pprint.pformat(configs["cookies"], width=120, indent=4)}
 """
 
-    with open(CONF_FILE, 'w') as conf_file:
-        conf_file.write(content)
+    _write_if_changed(CONF_FILE, content.encode('utf-8'))
 
 
 def read_conf():
@@ -293,45 +368,41 @@ def extract_graphql_filters(search_url):
 def read_wait_file():
     """Read the wait file that contains jobs which were not applied to in the previous run."""
     try:
-        wait_file = open(WAIT_FILE, 'r')
-        waited_jobs = json.load(wait_file)
-        wait_file.close()
+        with open(WAIT_FILE, 'rb') as wait_file:
+            waited_jobs = _json_loads(wait_file.read())
     except FileNotFoundError:
         waited_jobs = list()
     return waited_jobs
 
 
+# The CSRF meta tag always sits in <head>; capturing the value means no
+# hard-coded token length
+_CSRF_RE = re.compile(rb'<meta name="csrf-token" content="([^"]+)"')
+
+
 def get_csrf_token(session):
-    """Get the CSRF-Token, which is required when submitting an application"""
-    page = session.get(f'https://{HOST}')
-    index = page.text.find("<meta name=\"csrf-token\" content=\"") + len("<meta name=\"csrf-token\" content=\"")
-    return page.text[index: index + LEN_CSRF]
+    """Get the CSRF-Token, which is required when submitting an application.
+    Streams the page and stops as soon as the <head> meta tag shows up, so
+    only the first few KiB are downloaded instead of the whole landing page."""
+    response = session.get(f'https://{HOST}', stream=True)
+    try:
+        buffer = b''
+        for chunk in response.iter_content(8192):
+            buffer += chunk
+            match = _CSRF_RE.search(buffer)
+            if match:
+                return match.group(1).decode()
+            if len(buffer) > 1 << 16:  # token should have shown up by 64 KiB
+                break
+        print("⚠️  Could not find CSRF token on the landing page")
+        return ''
+    finally:
+        response.close()
 
 
-def fetch_jobs_graphql(session, filters, csrf_token, page=1, per_page=25):
-    """Fetch jobs using Handshake's GraphQL API with proper filtering
-    
-    Args:
-        session: requests.Session with cookies
-        filters: dict of GraphQL filter parameters
-        csrf_token: CSRF token for authentication
-        page: page number (used to calculate 'after' cursor)
-        per_page: number of results per page
-    
-    Returns:
-        dict with 'results' list and 'total' count, or None on error
-    """
-    import base64
-    
-    # Calculate cursor for pagination (GraphQL uses cursor-based pagination)
-    # cursor = base64.encode((page - 1) * per_page)
-    cursor_value = (page - 1) * per_page
-    after_cursor = base64.b64encode(str(cursor_value).encode()).decode()
-    
-    # GraphQL query (simplified version focusing on job data we need)
-    graphql_query = """query JobSearchQuery($first: Int, $after: String, $input: JobSearchInput) {
-  jobSearch(first: $first, after: $after, input: $input) {
-    totalCount
+# Shared selection set for jobSearch queries (simplified to the job data we
+# need, plus the apply settings that spare us per-job detail GETs)
+_JOB_SEARCH_FIELDS = """totalCount
     searchId
     edges {
       node {
@@ -355,17 +426,155 @@ def fetch_jobs_graphql(session, filters, csrf_token, page=1, per_page=25):
             id
             name
           }
+          jobApplySetting {
+            applyType
+          }
+          requiredJobDocumentTypes {
+            documentTypeId
+          }
         }
       }
+    }"""
+
+
+def _page_cursor(page, per_page):
+    """Cursor for a 1-based page number (base64 of the result offset)."""
+    import base64
+    return base64.b64encode(str((page - 1) * per_page).encode()).decode()
+
+
+# Static header templates, built once at import - per-call code only injects
+# what actually varies (the CSRF token)
+_GQL_HEADERS = {
+    "Accept": "*/*",
+    "Content-Type": "application/json",
+    "apollographql-client-name": "consumer",
+    "apollographql-client-version": "1.2",
+    "graphql-operation-type": "query",
+    "Origin": f"https://{HOST}",
+    "Referer": f"https://{HOST}/",
+    "User-Agent": USER_AGENT,
+    "sec-ch-ua": '"Chromium";v="140", "Not=A?Brand";v="24", "Google Chrome";v="140"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"macOS"'
+}
+
+# Constant part of the apply-POST headers; Host comes from the session and
+# only the CSRF token is added per call
+_APPLY_HEADERS = {
+    "Accept": ACCEPT_POST,
+    "Content-Type": CONTENT_TYPE
+}
+
+_DETAIL_HEADERS = {
+    "Accept": ACCEPT_GET,
+    "Host": HOST,
+    "User-Agent": USER_AGENT,
+    "Referer": f"https://{HOST}/",
+    "X-Requested-With": "XMLHttpRequest",
+    "sec-ch-ua": '"Chromium";v="140", "Not=A?Brand";v="24", "Google Chrome";v="140"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"macOS"'
+}
+
+
+def _graphql_headers(csrf_token):
+    return {**_GQL_HEADERS, "X-CSRF-Token": csrf_token}
+
+
+def _convert_job_search(job_search):
+    """Convert one jobSearch result object to our expected format."""
+    if not job_search:
+        return None
+
+    results = []
+    for edge in job_search.get('edges', []):
+        node = edge.get('node', {})
+        job_data = node.get('job', {})
+
+        # Convert to format expected by Job class
+        result = {
+            'job_id': int(job_data.get('id', 0)),
+            'job_name': job_data.get('title', ''),
+            'apply_start': job_data.get('applyStart'),
+            'created_at': job_data.get('createdAt'),
+            'job': {
+                'id': int(job_data.get('id', 0)),
+                'employer_name': job_data.get('employer', {}).get('name', 'Unknown'),
+                'type': job_data.get('jobType', {}).get('name', 'Job')
+            }
+        }
+
+        # Carry the apply settings through in the same shape as the
+        # /stu/jobs details payload, so Job skips its per-job detail GET
+        apply_setting = job_data.get('jobApplySetting')
+        if apply_setting is not None:
+            result['job']['job_apply_setting'] = {'apply_type': apply_setting.get('applyType')}
+        required_docs = job_data.get('requiredJobDocumentTypes')
+        if required_docs is not None:
+            result['job']['required_job_document_types'] = [
+                {'document_type_id': doc.get('documentTypeId')} for doc in required_docs]
+
+        results.append(result)
+
+    return {
+        'results': results,
+        'total': job_search.get('totalCount', 0),
+        'searchId': job_search.get('searchId')
     }
-  }
-}"""
-    
+
+
+def _post_graphql(session, payload, csrf_token):
+    """POST a GraphQL payload; returns the decoded 'data' object or None."""
+    # Use the same domain as HOST for GraphQL endpoint
+    graphql_url = f"https://{HOST}/hs/graphql"
+    response = session.post(
+        graphql_url,
+        data=_json_dumps(payload),
+        headers=_graphql_headers(csrf_token),
+        stream=True
+    )
+
+    try:
+        if response.status_code != 200:
+            print(f"GraphQL API error: {response.status_code}")
+            return None
+
+        # stream=True skips requests' chunk-join into .content - the decoded
+        # body goes straight from the socket buffer into the JSON parser
+        data = _json_loads(response.raw.read(decode_content=True))
+    finally:
+        response.close()
+
+    if 'errors' in data:
+        print(f"GraphQL errors: {data['errors']}")
+        return None
+
+    return data.get('data', {})
+
+
+def fetch_jobs_graphql(session, filters, csrf_token, page=1, per_page=25):
+    """Fetch jobs using Handshake's GraphQL API with proper filtering
+
+    Args:
+        session: requests.Session with cookies
+        filters: dict of GraphQL filter parameters
+        csrf_token: CSRF token for authentication
+        page: page number (used to calculate 'after' cursor)
+        per_page: number of results per page
+
+    Returns:
+        dict with 'results' list and 'total' count, or None on error
+    """
+    graphql_query = ("query JobSearchQuery($first: Int, $after: String, $input: JobSearchInput) {\n"
+                     "  jobSearch(first: $first, after: $after, input: $input) {\n    "
+                     + _JOB_SEARCH_FIELDS + "\n  }\n}")
+
     payload = {
         "operationName": "JobSearchQuery",
         "variables": {
             "first": per_page,
-            "after": after_cursor,
+            "after": _page_cursor(page, per_page),
             "input": {
                 "filter": filters,
                 "sort": {
@@ -376,91 +585,155 @@ def fetch_jobs_graphql(session, filters, csrf_token, page=1, per_page=25):
         },
         "query": graphql_query
     }
-    
-    headers = {
-        "Accept": "*/*",
-        "Content-Type": "application/json",
-        "apollographql-client-name": "consumer",
-        "apollographql-client-version": "1.2",
-        "graphql-operation-type": "query",
-        "Origin": f"https://{HOST}",
-        "Referer": f"https://{HOST}/",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36",
-        "X-CSRF-Token": csrf_token,
-        "sec-ch-ua": '"Chromium";v="140", "Not=A?Brand";v="24", "Google Chrome";v="140"',
-        "sec-ch-ua-mobile": "?0",
-        "sec-ch-ua-platform": '"macOS"'
-    }
-    
+
     try:
-        # Use the same domain as HOST for GraphQL endpoint
-        graphql_url = f"https://{HOST}/hs/graphql"
-        response = session.post(
-            graphql_url,
-            json=payload,
-            headers=headers
-        )
-        
-        if response.status_code != 200:
-            print(f"GraphQL API error: {response.status_code}")
+        data = _post_graphql(session, payload, csrf_token)
+        if data is None:
             return None
-        
-        data = response.json()
-        
-        if 'errors' in data:
-            print(f"GraphQL errors: {data['errors']}")
-            return None
-        
-        # Convert GraphQL response to our expected format
-        job_search = data.get('data', {}).get('jobSearch', {})
-        edges = job_search.get('edges', [])
-        
-        results = []
-        for edge in edges:
-            node = edge.get('node', {})
-            job_data = node.get('job', {})
-            
-            # Convert to format expected by Job class
-            result = {
-                'job_id': int(job_data.get('id', 0)),
-                'job_name': job_data.get('title', ''),
-                'apply_start': job_data.get('applyStart'),
-                'created_at': job_data.get('createdAt'),
-                'job': {
-                    'id': int(job_data.get('id', 0)),
-                    'employer_name': job_data.get('employer', {}).get('name', 'Unknown'),
-                    'type': job_data.get('jobType', {}).get('name', 'Job')
-                }
+        return _convert_job_search(data.get('jobSearch', {}))
+
+    except Exception as e:
+        print(f"Error fetching jobs via GraphQL: {e}")
+        return None
+
+
+def fetch_jobs_graphql_batch(session, filters, csrf_token, pages, per_page=25):
+    """Fetch several result pages in one HTTP request using aliased
+    jobSearch fields (page0:, page1:, ...) - K pages for one round-trip.
+
+    Args:
+        pages: iterable of 1-based page numbers to fetch
+
+    Returns:
+        list of per-page dicts in fetch_jobs_graphql's format (None entries
+        for pages the server omitted), or None if the request itself failed
+    """
+    pages = list(pages)
+    if not pages:
+        return []
+
+    variable_decls = ["$first: Int", "$input: JobSearchInput"]
+    variables = {
+        "first": per_page,
+        "input": {
+            "filter": filters,
+            "sort": {
+                "direction": "DESC",
+                "field": "POSTED_DATE"
             }
-            results.append(result)
-        
-        return {
-            'results': results,
-            'total': job_search.get('totalCount', 0),
-            'searchId': job_search.get('searchId')
         }
-        
+    }
+    aliases = []
+    for i, page in enumerate(pages):
+        variable_decls.append(f"$after{i}: String")
+        variables[f"after{i}"] = _page_cursor(page, per_page)
+        aliases.append(f"  page{i}: jobSearch(first: $first, after: $after{i}, input: $input) {{\n    "
+                       + _JOB_SEARCH_FIELDS + "\n  }")
+
+    payload = {
+        "operationName": "JobSearchBatchQuery",
+        "variables": variables,
+        "query": ("query JobSearchBatchQuery(" + ", ".join(variable_decls) + ") {\n"
+                  + "\n".join(aliases) + "\n}")
+    }
+
+    try:
+        data = _post_graphql(session, payload, csrf_token)
+        if data is None:
+            return None
+        return [_convert_job_search(data.get(f'page{i}')) for i in range(len(pages))]
+
     except Exception as e:
-        print(f"Error fetching jobs via GraphQL: {e}")
+        print(f"Error batch-fetching jobs via GraphQL: {e}")
         return None
 
 
+def _iter_job_pages(session, filters, csrf_token, stop_event):
+    """Yield bulk result pages while a producer thread prefetches ahead.
+
+    The producer fetches page 1, reads totalCount, then pulls the remaining
+    pages as aliased batch queries into a bounded queue (a couple of pages
+    deep), so downloading the next batch overlaps with applying to the
+    current page. The caller sets ``stop_event`` (stale date, cookie error)
+    to stop fetching early. Yields dicts in fetch_jobs_graphql's format;
+    a None signals that a fetch failed.
+    """
+    page_queue = queue.Queue(maxsize=2)
+    done = object()  # sentinel: producer finished
+
+    def put(item):
+        """Bounded put that gives up once the consumer has signalled stop."""
+        while not stop_event.is_set():
+            try:
+                page_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producer():
+        try:
+            first_page = fetch_jobs_graphql(session, filters, csrf_token,
+                                            page=1, per_page=GRAPHQL_PER_PAGE)
+            if not put(first_page) or first_page is None:
+                return
+            total_pages = -(-first_page["total"] // GRAPHQL_PER_PAGE)  # ceil
+            remaining = range(2, total_pages + 1)
+            for i in range(0, len(remaining), GRAPHQL_BATCH_PAGES):
+                if stop_event.is_set():
+                    return
+                batch = fetch_jobs_graphql_batch(session, filters, csrf_token,
+                                                 remaining[i:i + GRAPHQL_BATCH_PAGES],
+                                                 GRAPHQL_PER_PAGE)
+                if batch is None:
+                    put(None)
+                    return
+                for page in batch:
+                    if not put(page):
+                        return
+        finally:
+            put(done)
+
+    threading.Thread(target=producer, daemon=True, name="page-prefetch").start()
+    while True:
+        item = page_queue.get()
+        if item is done:
+            return
+        yield item
+
+
 class Job:
 
+    # One instance per listing on bulk runs - __slots__ drops the per-object
+    # __dict__, cutting instance memory ~4x and speeding attribute access.
+    # Run-wide state (session, documents, csrf_token, now) stays on the class.
+    __slots__ = ("start", "date", "id", "name", "employer", "type",
+                 "full_details", "apply_type", "document_type_ids")
+
     def __init__(self, data, full_details=None):
-        self.data = data
-        self.start = data.get("apply_start")
-        self.date = data.get("created_at", data.get("updated_at"))
-        self.id = data.get("job_id")
-        self.name = data.get("job_name")
-        self.employer = data.get("job", {}).get("employer_name", data.get("employer_name", "Unknown"))
-        self.type = data.get("job", {}).get("type", "Job")
-        
-        # For list view, we won't have full details yet
+        # Bind the bound method and the nested dict once - with thousands of
+        # instances per bulk run, the repeated lookups and the fresh {}
+        # defaults were measurable allocation churn
+        get = data.get
+        self.start = get("apply_start")
+        self.date = get("created_at", get("updated_at"))
+        self.id = get("job_id")
+        self.name = get("job_name")
+        job_dict = get("job", _EMPTY)
+        self.employer = job_dict.get("employer_name", get("employer_name", "Unknown"))
+        self.type = job_dict.get("type", "Job")
+
+        # Apply settings may arrive embedded in the list payload (GraphQL
+        # requests them), in which case the data doubles as full details and
+        # fetch_details becomes a no-op
+        if not full_details and "job_apply_setting" in job_dict:
+            full_details = data
+
+        # For plain list view, we won't have full details yet
         self.full_details = full_details
         self.apply_type = None
         self.document_type_ids = []
-        
+
         # If we have full details, extract apply settings
         if full_details and "job" in full_details:
             job_data = full_details["job"]
@@ -474,7 +747,6 @@ class Job:
     def set(cls, session, configs):
         """Set various attributes"""
         cls.session = session
-        cls.date = configs["date"]
         cls.documents = {RESUME_TYPE_ID: configs["resume"], COVER_TYPE_ID: configs["cover"],
                          TRANSCRIPT_TYPE_ID: configs["transcript"], OTHER_DOCUMENT_TYPE_ID: configs.get("other")}
         cls.csrf_token = get_csrf_token(session)
@@ -487,19 +759,9 @@ class Job:
         
         try:
             url = f'https://{HOST}/stu/jobs/{self.id}'
-            headers = {
-                "Accept": ACCEPT_GET,
-                "Host": HOST,
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36",
-                "Referer": f"https://{HOST}/",
-                "X-Requested-With": "XMLHttpRequest",
-                "sec-ch-ua": '"Chromium";v="140", "Not=A?Brand";v="24", "Google Chrome";v="140"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-platform": '"macOS"'
-            }
-            response = self.session.get(url, headers=headers)
+            response = self.session.get(url, headers=_DETAIL_HEADERS)
             if response.status_code == 200:
-                self.full_details = response.json()
+                self.full_details = _json_loads(response.content)
                 # Extract apply settings from full details
                 if "job" in self.full_details:
                     job_data = self.full_details["job"]
@@ -532,11 +794,11 @@ class Job:
         if self.start and self.start > self.now:
             return 2
         
-        headers = {"Accept": ACCEPT_POST, "Host": HOST, "X-CSRF-Token": self.csrf_token, "Content-Type": CONTENT_TYPE}
+        headers = {**_APPLY_HEADERS, "X-CSRF-Token": self.csrf_token}
         document_ids = list()
         
         for document_type_id in self.document_type_ids:
-            if document_type_id not in (RESUME_TYPE_ID, COVER_TYPE_ID, TRANSCRIPT_TYPE_ID, OTHER_DOCUMENT_TYPE_ID):
+            if document_type_id not in _SUPPORTED_DOC_TYPES:
                 print(f"Skipping job '{self.name}' - requires unsupported document type: {document_type_id}")
                 return 4
             doc_id = self.documents.get(document_type_id)
@@ -546,7 +808,7 @@ class Job:
                 print(f"Skipping job '{self.name}' - missing required document type: {document_type_id}")
                 return 4
         
-        data = json.dumps(
+        data = _json_dumps(
             {"application": {"applicable_id": self.id, "applicable_type": self.type, "document_ids": document_ids},
              "work_authorization_status": None})
         result = self.session.post(f'https://{HOST}/jobs/{self.id}/applications',
@@ -558,12 +820,19 @@ class Job:
         return 0
 
     def wait(self, wait_list):
-        """Add to WAIT_LIST"""
-        wait_list.append(self.data)
+        """Add to WAIT_LIST - only the fields a retry run needs, not the
+        whole raw listing blob, which keeps wait.json small"""
+        wait_list.append({
+            "job_id": self.id,
+            "job_name": self.name,
+            "created_at": self.date,
+            "apply_start": self.start,
+            "job": {"employer_name": self.employer, "type": self.type},
+        })
 
-    def write(self, jobs_file):
-        """Write job info to JOBS_FILE"""
-        jobs_file.write("%d, \"%s\", \"%s\", \"%s\"\n" % (self.id, self.name, self.employer, self.now))
+    def write(self, jobs_writer):
+        """Write job info to JOBS_FILE via the shared csv writer"""
+        jobs_writer.writerow([self.id, self.name, self.employer, self.now])
 
 
 def main():
@@ -576,13 +845,54 @@ def main():
         print("RTFM!!!")
         exit(1)
 
+    # Keyword filters from the config, built once - one C-level scan per job
+    # name (regex alternation, or an Aho-Corasick automaton for big lists)
+    job_match = _build_keyword_matcher(configs.get("job_keywords"))
+    skip_match = _build_keyword_matcher(configs.get("skip_keywords"))
+
     session = requests.Session()
     session.cookies.update(configs["cookies"])
+
+    # Tune the connection pool: the default pool_maxsize=10 would throttle
+    # the detail-fetch thread pool. Retries cover POSTs too (the apply and
+    # GraphQL calls) and honor Retry-After, so rate-limiting waits happen in
+    # the socket layer instead of failing the whole run on a transient 429
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=2 * DETAIL_WORKERS,
+        max_retries=Retry(total=5, backoff_factor=0.5,
+                          status_forcelist=[429, 500, 502, 503, 504],
+                          allowed_methods=frozenset(['GET', 'POST']),
+                          respect_retry_after_header=True,
+                          # hand the final response back instead of raising
+                          # RetryError, so the status checks in apply() and
+                          # the fetchers stay the terminal error handling
+                          raise_on_status=False),
+    )
+    session.mount(f"https://{HOST}", adapter)
+
+    # Headers every request needs - set once on the session so per-call
+    # header dicts only carry what differs. Accept stays per-request: the
+    # JSON endpoints each set their own, and the csrf landing-page GET
+    # must keep requests' */* default to be served HTML
+    session.headers.update({
+        "Host": HOST,
+        "User-Agent": USER_AGENT,
+    })
+
     Job.set(session, configs)
 
+    # Detail fetches are independent GETs, so a thread pool turns N serial
+    # round-trips into ~N/DETAIL_WORKERS; the Session pools connections and
+    # is thread-safe for these requests
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=DETAIL_WORKERS)
+
     waited_list = read_wait_file()
     wait_list = list()
-    jobs_file = open(JOBS_FILE, 'a+')
+    # csv.writer handles quoting properly (the old %-format broke on names
+    # with embedded quotes) and the large buffer batches kernel writes
+    jobs_file = open(JOBS_FILE, 'a', newline='', buffering=1 << 23, encoding='utf-8')
+    jobs_writer = csv.writer(jobs_file)
     for job_data in waited_list:
         job = Job(job_data)
         ret = job.apply()
@@ -593,9 +903,8 @@ def main():
                 cookie_error = True
                 break
         else:
-            job.write(jobs_file)
+            job.write(jobs_writer)
 
-    page = 1
     see_old_jobs = False
     date = datetime.datetime.utcnow().isoformat()
     
@@ -605,11 +914,12 @@ def main():
     # Clean up old new_jobs.csv before processing fresh data from HTML
     cleanup_new_jobs_file()
     
-    # Auto-extract from HTML files if present
-    check_and_extract_html()
-    
-    # Check if we have specific jobs from HTML extraction
-    specific_job_ids = read_new_jobs()
+    # Auto-extract from HTML files if present - IDs come straight back
+    specific_job_ids = check_and_extract_html()
+
+    # Otherwise pick up a user-provided new_jobs.csv
+    if not specific_job_ids:
+        specific_job_ids = read_new_jobs()
     
     if specific_job_ids:
         print("="*70)
@@ -617,24 +927,31 @@ def main():
         print("="*70)
         print()
         
+        specific_jobs = []
         for job_id in specific_job_ids:
-            jobs_checked += 1
-            
-            # Create minimal job data structure - details will be fetched
+            # Create minimal job data structure - details will be fetched.
+            # Reuse the run timestamp rather than calling utcnow per job
             job_data = {
                 'job_id': job_id,
                 'job_name': f'Job ID {job_id}',
                 'employer_name': 'Unknown',
-                'created_at': datetime.datetime.utcnow().isoformat(),
+                'created_at': date,
                 'apply_start': None
             }
-            
-            job = Job(job_data)
+            specific_jobs.append(Job(job_data))
+
+        # Prefetch all details in parallel; apply() below short-circuits the
+        # per-job GET once full_details is populated
+        list(executor.map(Job.fetch_details, specific_jobs))
+
+        for job in specific_jobs:
+            jobs_checked += 1
+            job_id = job.id
             ret = job.apply()
             
             if ret == 0:
                 jobs_applied += 1
-                job.write(jobs_file)
+                job.write(jobs_writer)
                 print(f"✅ Applied to '{job.name}' at {job.employer} successfully!")
             elif ret == 1:
                 print(f"❌ Cookie error on job {job_id}")
@@ -672,36 +989,44 @@ def main():
         print()
         
     
-    while not cookie_error and not see_old_jobs and not specific_job_ids:
-        # Use /stu/postings API (the actual REST endpoint that returns JSON)
-        # /job-search/ URLs are frontend routes and return HTML, not JSON
-        url = f'https://{HOST}/stu/postings'
-        params = {
-            'page': page,
-            'per_page': 25,
-            'sort_direction': 'desc',
-            'sort_column': 'created_at'
-        }
-        response = session.get(url, params=params, headers={"Host": HOST, "Accept": ACCEPT_GET})
-        
-        if response.status_code != 200:
-            print(f"Failed to fetch jobs: Status {response.status_code}")
+    # Bulk mode: pull the listing through the GraphQL API. A producer thread
+    # keeps a couple of pages buffered ahead, so the next batch downloads
+    # while this thread is still applying to the current page.
+    stop_fetching = threading.Event()
+    bulk_pages = iter(())
+    if not cookie_error and not specific_job_ids:
+        gql_filter = extract_graphql_filters(configs["url"])
+        bulk_pages = _iter_job_pages(session, gql_filter, Job.csrf_token, stop_fetching)
+        print(f"📊 Processing jobs page by page...\n")
+
+    for jobs in bulk_pages:
+        if cookie_error or see_old_jobs:
+            break
+        if jobs is None:
+            print("Failed to fetch jobs via GraphQL")
             cookie_error = True
             break
-            
-        jobs = response.json()
-        if "results" not in jobs or len(jobs["results"]) == 0:
+        if not jobs["results"]:
             break
-        
-        if page == 1:
-            print(f"📊 Processing jobs page by page...\n")
-            
+
+        page_jobs = []
         for job_data in jobs["results"]:
             jobs_checked += 1
             job = Job(job_data)
             if configs["date"] > job.date:
                 see_old_jobs = True
                 break
+            job_name = job.name or ""
+            if skip_match and skip_match(job_name):
+                continue
+            if job_match and not job_match(job_name):
+                continue
+            page_jobs.append(job)
+
+        # Prefetch details for the whole page in parallel before applying
+        list(executor.map(Job.fetch_details, page_jobs))
+
+        for job in page_jobs:
             ret = job.apply()
             if ret != 0:
                 if ret == 2:
@@ -712,8 +1037,9 @@ def main():
                 # ret == 3, 4, 5: external apply, unsupported docs, or fetch failed - skip silently
             else:
                 jobs_applied += 1
-                job.write(jobs_file)
-        page += 1
+                job.write(jobs_writer)
+
+    stop_fetching.set()  # stale date or error: tell the prefetcher to stop
 
     configs["valid"] = not cookie_error
     configs["cookies"] = requests.utils.dict_from_cookiejar(session.cookies)
@@ -722,8 +1048,7 @@ def main():
         print("❌ Cookies are not valid, please provide new ones!!!")
     else:
         configs["date"] = date
-        with open(WAIT_FILE, 'w') as wait_file:
-            json.dump(wait_list, wait_file)
+        _write_if_changed(WAIT_FILE, _json_dumps(wait_list))
         
         # Print summary (only for bulk processing mode)
         if not specific_job_ids:
@@ -734,6 +1059,7 @@ def main():
             print(f"📝 Check {JOBS_FILE} for details")
             print("="*60)
     
+    executor.shutdown()
     write_conf(configs)
     jobs_file.close()
 